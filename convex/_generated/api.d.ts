@@ -11,6 +11,7 @@
 import type * as agents from "../agents.js";
 import type * as authors from "../authors.js";
 import type * as contentPipeline from "../contentPipeline.js";
+import type * as counters from "../counters.js";
 import type * as dashboard from "../dashboard.js";
 import type * as draftengine from "../draftengine.js";
 import type * as events from "../events.js";
@@ -34,6 +35,7 @@ declare const fullApi: ApiFromModules<{
   agents: typeof agents;
   authors: typeof authors;
   contentPipeline: typeof contentPipeline;
+  counters: typeof counters;
   dashboard: typeof dashboard;
   draftengine: typeof draftengine;
   events: typeof events;
@@ -4,6 +4,7 @@
  */
 import { mutation, query } from "./_generated/server";
 import { v } from "convex/values";
+import { insertCounted, patchCounted, deleteCounted } from "./counters";
 
 // ---- Helpers ----
 
@@ -134,7 +135,7 @@ export const upsertAgent = mutation({
       .first();
 
     if (existing) {
-      await ctx.db.patch(existing._id, {
+      await patchCounted(ctx, "agents", existing._id, {
         role: args.role,
         model: args.model,
         avatar: args.avatar,
@@ -144,7 +145,7 @@ export const upsertAgent = mutation({
       return existing._id;
     }
 
-    return await ctx.db.insert("agents", {
+    return await insertCounted(ctx, "agents", {
       name: args.name,
       role: args.role,
       model: args.model,
@@ -164,7 +165,7 @@ export const updateAgentStatus = mutation({
     status: v.union(v.literal("active"), v.literal("idle"), v.literal("offline")),
   },
   handler: async (ctx, args) => {
-    await ctx.db.patch(args.id, {
+    await patchCounted(ctx, "agents", args.id, {
       status: args.status,
       lastActive: new Date().toISOString(),
     });
@@ -185,7 +186,7 @@ export const createAgent = mutation({
   },
   handler: async (ctx, args) => {
     const now = new Date().toISOString();
-    return await ctx.db.insert("agents", {
+    return await insertCounted(ctx, "agents", {
       name: args.name,
       role: args.role,
       description: args.description,
@@ -227,7 +228,7 @@ export const updateAgent = mutation({
     if (updates.status) {
       filtered.lastActive = new Date().toISOString();
     }
-    await ctx.db.patch(id, filtered);
+    await patchCounted(ctx, "agents", id, filtered);
   },
 });
 
@@ -235,7 +236,7 @@ export const updateAgent = mutation({
 export const deleteAgent = mutation({
   args: { id: v.id("agents") },
   handler: async (ctx, args) => {
-    await ctx.db.delete(args.id);
+    await deleteCounted(ctx, "agents", args.id);
   },
 });
 
@@ -255,6 +256,39 @@ export const updateAgentLLMConfig = mutation({
   },
 });
 
+/**
+ * Set (or clear) an agent's model routing policy.
+ * Candidates are ranked; provider is auto-detected from modelId when omitted.
+ */
+export const setAgentRoutingPolicy = mutation({
+  args: {
+    id: v.id("agents"),
+    routingPolicy: v.optional(v.object({
+      expectedOutputTokens: v.optional(v.number()),
+      candidates: v.array(v.object({
+        modelId: v.string(),
+        provider: v.optional(v.string()),
+        maxPromptTokens: v.optional(v.number()),
+        maxOutputTokens: v.optional(v.number()),
+        maxP95LatencyMs: v.optional(v.number()),
+      })),
+    })),
+  },
+  handler: async (ctx, args) => {
+    const routingPolicy = args.routingPolicy && {
+      ...args.routingPolicy,
+      candidates: args.routingPolicy.candidates.map((c) => ({
+        ...c,
+        provider: c.provider || getProviderForModel(c.modelId),
+      })),
+    };
+    await ctx.db.patch(args.id, {
+      routingPolicy,
+      updatedAt: new Date().toISOString(),
+    });
+  },
+});
+
 /** Update Image Maker agent with new systemPrompt for 3-image generation */
 export const updateImageMakerPrompt = mutation({
   handler: async (ctx) => {
@@ -427,7 +461,7 @@ export const seedAgentHierarchy = mutation({
     const allAgents = await ctx.db.query("agents").collect();
     for (const agent of allAgents) {
       if (!validNames.has(agent.name)) {
-        await ctx.db.delete(agent._id);
+        await deleteCounted(ctx, "agents", agent._id);
         results.deleted++;
       }
     }
@@ -438,7 +472,7 @@ export const seedAgentHierarchy = mutation({
 
     for (const [name, spec] of Object.entries(hierarchy)) {
       if (!existingNames.has(name)) {
-        await ctx.db.insert("agents", {
+        await insertCounted(ctx, "agents", {
           name,
           role: spec.defaultRole,
           modelId: spec.modelId,
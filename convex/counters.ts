@@ -0,0 +1,146 @@
+/**
+ * ISTK Mission Control - Dashboard counters
+ * Precomputed counts for dashboard.getStats, kept up to date incrementally by the
+ * mutations that write tasks, events, memories and agents (via the *Counted helpers).
+ */
+import { mutation, MutationCtx, QueryCtx } from "./_generated/server";
+import { Doc, Id } from "./_generated/dataModel";
+import { WithoutSystemFields } from "convex/server";
+
+type CountedTable = "tasks" | "events" | "memories" | "agents";
+
+/** Marker row written by rebuildCounters — until it exists, counters are not maintained */
+const INITIALIZED_KEY = "_initialized";
+
+// ---- Helpers ----
+
+/** Counter keys a document contributes +1 to */
+function counterKeys(table: CountedTable, doc: Record<string, any>): string[] {
+  switch (table) {
+    case "tasks":
+      return [
+        "tasks.total",
+        `tasks.status.${doc.status}`,
+        `tasks.priority.${doc.priority}`,
+        `tasks.assignee.${doc.assignee}`,
+      ];
+    case "events":
+      return ["events.total", `events.status.${doc.status}`, `events.type.${doc.type}`];
+    case "memories":
+      return ["memories.total", `memories.date.${doc.date}`];
+    case "agents":
+      // Dashboard only counts Mission Control agents
+      if (doc.teamType === "draftengine") return [];
+      return ["agents.total", `agents.status.${doc.status}`];
+  }
+}
+
+async function getCounterRow(ctx: QueryCtx, key: string) {
+  return await ctx.db
+    .query("counters")
+    .withIndex("by_key", (q) => q.eq("key", key))
+    .first();
+}
+
+/** Read a counter value (0 if missing) */
+export async function getCount(ctx: QueryCtx, key: string): Promise<number> {
+  return (await getCounterRow(ctx, key))?.value ?? 0;
+}
+
+/** Whether counters have been backfilled (rebuildCounters has run) */
+export async function countersInitialized(ctx: QueryCtx): Promise<boolean> {
+  return (await getCounterRow(ctx, INITIALIZED_KEY)) !== null;
+}
+
+/** Apply the counter changes for a document going from `before` to `after` (null = absent) */
+export async function updateCounters(
+  ctx: MutationCtx,
+  table: CountedTable,
+  before: Record<string, any> | null,
+  after: Record<string, any> | null
+) {
+  if (!(await countersInitialized(ctx))) return;
+
+  const deltas = new Map<string, number>();
+  for (const key of before ? counterKeys(table, before) : []) {
+    deltas.set(key, (deltas.get(key) ?? 0) - 1);
+  }
+  for (const key of after ? counterKeys(table, after) : []) {
+    deltas.set(key, (deltas.get(key) ?? 0) + 1);
+  }
+
+  for (const [key, delta] of Array.from(deltas.entries())) {
+    if (delta === 0) continue;
+    const row = await getCounterRow(ctx, key);
+    if (row) {
+      await ctx.db.patch(row._id, { value: row.value + delta });
+    } else {
+      await ctx.db.insert("counters", { key, value: delta });
+    }
+  }
+}
+
+/** Insert a document and count it */
+export async function insertCounted<T extends CountedTable>(
+  ctx: MutationCtx,
+  table: T,
+  doc: WithoutSystemFields<Doc<T>>
+): Promise<Id<T>> {
+  const id = await ctx.db.insert(table, doc);
+  await updateCounters(ctx, table, null, doc);
+  return id;
+}
+
+/** Patch a document and move its counts if counted fields changed */
+export async function patchCounted<T extends CountedTable>(
+  ctx: MutationCtx,
+  table: T,
+  id: Id<T>,
+  patch: Record<string, unknown>
+) {
+  const before = await ctx.db.get(id);
+  await ctx.db.patch(id, patch as any);
+  await updateCounters(ctx, table, before, await ctx.db.get(id));
+}
+
+/** Delete a document and uncount it */
+export async function deleteCounted<T extends CountedTable>(
+  ctx: MutationCtx,
+  table: T,
+  id: Id<T>
+) {
+  const before = await ctx.db.get(id);
+  await ctx.db.delete(id);
+  await updateCounters(ctx, table, before, null);
+}
+
+// ---- Mutations ----
+
+/** Recompute all counters from scratch (run once after deploy, or to repair drift) */
+export const rebuildCounters = mutation({
+  args: {},
+  handler: async (ctx) => {
+    const existing = await ctx.db.query("counters").collect();
+    for (const row of existing) {
+      await ctx.db.delete(row._id);
+    }
+
+    const totals = new Map<string, number>();
+    const tables: CountedTable[] = ["tasks", "events", "memories", "agents"];
+    for (const table of tables) {
+      const docs = await ctx.db.query(table).collect();
+      for (const doc of docs) {
+        for (const key of counterKeys(table, doc)) {
+          totals.set(key, (totals.get(key) ?? 0) + 1);
+        }
+      }
+    }
+
+    for (const [key, value] of Array.from(totals.entries())) {
+      await ctx.db.insert("counters", { key, value });
+    }
+    await ctx.db.insert("counters", { key: INITIALIZED_KEY, value: 1 });
+
+    return { ok: true, counters: totals.size };
+  },
+});
@@ -3,10 +3,53 @@
  * Provides stats and overview data for the main dashboard
  */
 import { query } from "./_generated/server";
+import { countersInitialized, getCount } from "./counters";
 
-/** Get dashboard stats: task counts, event counts, memory counts */
+/**
+ * Get dashboard stats: task counts, event counts, memory counts.
+ * Reads precomputed counters; falls back to a full scan until counters.rebuildCounters has run.
+ */
 export const getStats = query({
   handler: async (ctx) => {
+    if (await countersInitialized(ctx)) {
+      const today = new Date().toISOString().split("T")[0];
+      const keys = [
+        "tasks.total", "tasks.status.todo", "tasks.status.in_progress", "tasks.status.done",
+        "tasks.priority.critical", "tasks.assignee.Gregory", "tasks.assignee.Milton",
+        "events.total", "events.status.active", "events.type.cron", "events.type.deadline",
+        "memories.total", `memories.date.${today}`,
+        "agents.total", "agents.status.active",
+      ];
+      const values = await Promise.all(keys.map((key) => getCount(ctx, key)));
+      const c = Object.fromEntries(keys.map((key, i) => [key, values[i]]));
+
+      return {
+        tasks: {
+          total: c["tasks.total"],
+          todo: c["tasks.status.todo"],
+          inProgress: c["tasks.status.in_progress"],
+          done: c["tasks.status.done"],
+          critical: c["tasks.priority.critical"],
+          gregorys: c["tasks.assignee.Gregory"],
+          miltons: c["tasks.assignee.Milton"],
+        },
+        events: {
+          total: c["events.total"],
+          active: c["events.status.active"],
+          crons: c["events.type.cron"],
+          deadlines: c["events.type.deadline"],
+        },
+        memories: {
+          total: c["memories.total"],
+          today: c[`memories.date.${today}`],
+        },
+        agents: {
+          total: c["agents.total"],
+          active: c["agents.status.active"],
+        },
+      };
+    }
+
     const tasks = await ctx.db.query("tasks").collect();
     const events = await ctx.db.query("events").collect();
     const memories = await ctx.db.query("memories").collect();
@@ -4,6 +4,7 @@
  */
 import { mutation, query } from "./_generated/server";
 import { v } from "convex/values";
+import { insertCounted, patchCounted, deleteCounted } from "./counters";
 
 // ---- Queries ----
 
@@ -63,7 +64,7 @@ export const createEvent = mutation({
   },
   handler: async (ctx, args) => {
     const now = new Date().toISOString();
-    return await ctx.db.insert("events", {
+    return await insertCounted(ctx, "events", {
       title: args.title,
       description: args.description,
       type: args.type,
@@ -96,7 +97,7 @@ export const syncCronEvent = mutation({
     const existing = events.find((e) => e.title === args.title);
 
     if (existing) {
-      await ctx.db.patch(existing._id, {
+      await patchCounted(ctx, "events", existing._id, {
         schedule: args.schedule,
         lastRun: args.lastRun,
         nextRun: args.nextRun,
@@ -104,7 +105,7 @@ export const syncCronEvent = mutation({
       });
       return existing._id;
     } else {
-      return await ctx.db.insert("events", {
+      return await insertCounted(ctx, "events", {
         title: args.title,
         type: "cron",
         schedule: args.schedule,
@@ -125,7 +126,7 @@ export const toggleEventStatus = mutation({
     const event = await ctx.db.get(args.id);
     if (!event) throw new Error("Event not found");
     const newStatus = event.status === "active" ? "paused" : "active";
-    await ctx.db.patch(args.id, { status: newStatus });
+    await patchCounted(ctx, "events", args.id, { status: newStatus });
   },
 });
 
@@ -133,6 +134,6 @@ export const toggleEventStatus = mutation({
 export const deleteEvent = mutation({
   args: { id: v.id("events") },
   handler: async (ctx, args) => {
-    await ctx.db.delete(args.id);
+    await deleteCounted(ctx, "events", args.id);
   },
 });
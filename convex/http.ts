@@ -634,6 +634,7 @@ http.route({
             provider: agent.provider,
             modelId: agent.modelId,
             systemPrompt: agent.systemPrompt,
+            routingPolicy: agent.routingPolicy,
           },
         }),
         { status: 200, headers: { "Content-Type": "application/json" } }
@@ -715,6 +716,36 @@ http.route({
   }),
 });
 
+// ---- POST /api/workflow/step-states ----
+// Current status of the daemon's in-flight steps (cancellation feed)
+// Steps that were skipped (workflow cancelled) or deleted should be aborted
+http.route({
+  path: "/api/workflow/step-states",
+  method: "POST",
+  handler: httpAction(async (ctx, request) => {
+    if (!checkAuth(request)) {
+      return new Response("Unauthorized", { status: 401 });
+    }
+    try {
+      const body = await request.json();
+      const stepIds = (body.stepIds || []) as string[];
+      const states = await ctx.runQuery(api.workflows.getStepStatuses, {
+        stepIds: stepIds as any,
+      });
+      return new Response(
+        JSON.stringify({ ok: true, states }),
+        { status: 200, headers: { "Content-Type": "application/json" } }
+      );
+    } catch (err: unknown) {
+      const message = err instanceof Error ? err.message : "Unknown error";
+      return new Response(
+        JSON.stringify({ ok: false, error: message }),
+        { status: 500, headers: { "Content-Type": "application/json" } }
+      );
+    }
+  }),
+});
+
 // ---- POST /api/workflow/step-status ----
 // Update step status (e.g. pending → agent_working)
 http.route({
@@ -762,6 +793,8 @@ http.route({
       await ctx.runMutation(api.workflows.updateStepOutput, {
         stepId: body.stepId,
         output: body.output,
+        servedProvider: body.servedProvider,
+        servedModelId: body.servedModelId,
       });
 
       // Get the step to check if we should advance
@@ -1049,6 +1082,31 @@ http.route({
   }),
 });
 
+// ---- POST /api/admin/rebuild-counters ----
+// Backfill/repair the dashboard counters table (run once after deploying counters)
+http.route({
+  path: "/api/admin/rebuild-counters",
+  method: "POST",
+  handler: httpAction(async (ctx, request) => {
+    if (!checkAuth(request)) {
+      return new Response("Unauthorized", { status: 401 });
+    }
+    try {
+      const result = await ctx.runMutation(api.counters.rebuildCounters, {});
+      return new Response(
+        JSON.stringify(result),
+        { status: 200, headers: { "Content-Type": "application/json" } }
+      );
+    } catch (err: unknown) {
+      const message = err instanceof Error ? err.message : "Unknown error";
+      return new Response(
+        JSON.stringify({ ok: false, error: message }),
+        { status: 500, headers: { "Content-Type": "application/json" } }
+      );
+    }
+  }),
+});
+
 // ---- GET /api/admin/agent-llm-config ----
 // Diagnostic: List all agents with their modelId and provider
 http.route({
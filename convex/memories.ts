@@ -4,6 +4,7 @@
  */
 import { mutation, query } from "./_generated/server";
 import { v } from "convex/values";
+import { insertCounted, patchCounted, deleteCounted } from "./counters";
 
 // ---- Queries ----
 
@@ -108,7 +109,7 @@ export const addMemory = mutation({
     const now = new Date().toISOString();
     const today = now.split("T")[0];
 
-    return await ctx.db.insert("memories", {
+    return await insertCounted(ctx, "memories", {
       title: args.title,
       content: args.content,
       source: args.source,
@@ -144,7 +145,7 @@ export const syncMemory = mutation({
 
     if (existing) {
       // Update existing memory
-      await ctx.db.patch(existing._id, {
+      await patchCounted(ctx, "memories", existing._id, {
         title: args.title,
         content: args.content,
         category: args.category,
@@ -156,7 +157,7 @@ export const syncMemory = mutation({
       return existing._id;
     } else {
       // Create new memory
-      return await ctx.db.insert("memories", {
+      return await insertCounted(ctx, "memories", {
         title: args.title,
         content: args.content,
         source: args.source,
@@ -175,7 +176,7 @@ export const syncMemory = mutation({
 export const deleteMemory = mutation({
   args: { id: v.id("memories") },
   handler: async (ctx, args) => {
-    await ctx.db.delete(args.id);
+    await deleteCounted(ctx, "memories", args.id);
   },
 });
 
@@ -95,12 +95,32 @@ export default defineSchema({
     department: v.optional(v.string()),             // "content_production" | "research" | "distribution" | "creative"
     // ---- Product Assignment ----
     teamType: v.optional(v.string()),               // "mission_control" | "draftengine" — separates agents by product
+    // ---- Model Routing (optional) ----
+    // Ranked candidate models; the daemon picks the fastest qualifying candidate per call,
+    // falling back to provider/modelId above when none qualifies
+    routingPolicy: v.optional(v.object({
+      expectedOutputTokens: v.optional(v.number()), // Override for the observed output size of this role
+      candidates: v.array(v.object({
+        modelId: v.string(),
+        provider: v.string(),
+        maxPromptTokens: v.optional(v.number()),    // Skip this model for larger prompts
+        maxOutputTokens: v.optional(v.number()),    // Skip this model when expected output is larger
+        maxP95LatencyMs: v.optional(v.number()),    // Skip this model while its recent p95 is slower
+      })),
+    })),
   })
     .index("by_status", ["status"])
     .index("by_name", ["name"])
     .index("by_agentRole", ["agentRole"])
     .index("by_teamType", ["teamType"]),
 
+  // ---- Dashboard Counters ----
+  // Precomputed counts for dashboard.getStats (maintained by convex/counters.ts helpers)
+  counters: defineTable({
+    key: v.string(),                    // e.g. "tasks.total", "tasks.status.todo", "memories.date.2026-01-31"
+    value: v.number(),
+  }).index("by_key", ["key"]),
+
   // ---- System Status (daemon health, sync status, etc.) ----
   systemStatus: defineTable({
     key: v.string(),                    // e.g. "daemon_health"
@@ -241,7 +261,9 @@ export default defineSchema({
   })
     .index("by_status", ["status"])
     .index("by_templateId", ["templateId"])
-    .index("by_sourceResearchId", ["sourceResearchId"]),
+    .index("by_sourceResearchId", ["sourceResearchId"])
+    .index("by_createdAt", ["createdAt"])                 // ISO strings sort chronologically
+    .index("by_status_createdAt", ["status", "createdAt"]),
 
   // ---- Workflow Steps ----
   // Individual step execution records within a workflow
@@ -275,6 +297,8 @@ export default defineSchema({
     completedAt: v.optional(v.string()),
     timeoutMinutes: v.number(),
     retryCount: v.optional(v.number()),
+    servedProvider: v.optional(v.string()), // Provider that produced the output (may differ from agent default via routing)
+    servedModelId: v.optional(v.string()),  // Model that produced the output
     createdAt: v.string(),
     updatedAt: v.string(),
   })
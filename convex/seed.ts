@@ -6,6 +6,7 @@
  * Idempotent: checks for existing templates/agents before creating.
  */
 import { mutation } from "./_generated/server";
+import { insertCounted } from "./counters";
 
 // ============================================================
 // WORKFLOW TEMPLATES (Section 6.1–6.4)
@@ -1009,7 +1010,7 @@ export const seedWorkflowData = mutation({
         continue;
       }
 
-      await ctx.db.insert("agents", {
+      await insertCounted(ctx, "agents", {
         name: agent.name,
         role: agent.role,
         description: agent.description,
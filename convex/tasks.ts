@@ -4,6 +4,7 @@
  */
 import { mutation, query } from "./_generated/server";
 import { v } from "convex/values";
+import { insertCounted, patchCounted, deleteCounted } from "./counters";
 
 // ---- Queries ----
 
@@ -72,7 +73,7 @@ export const createTask = mutation({
       ? Math.max(...todos.map((t) => t.order)) + 1
       : 0;
 
-    return await ctx.db.insert("tasks", {
+    return await insertCounted(ctx, "tasks", {
       title: args.title,
       description: args.description,
       status: "todo",
@@ -103,7 +104,7 @@ export const updateTaskStatus = mutation({
     if (args.order !== undefined) {
       updates.order = args.order;
     }
-    await ctx.db.patch(args.id, updates);
+    await patchCounted(ctx, "tasks", args.id, updates);
   },
 });
 
@@ -130,7 +131,7 @@ export const updateTask = mutation({
     const filtered = Object.fromEntries(
       Object.entries(updates).filter(([_, v]) => v !== undefined)
     );
-    await ctx.db.patch(id, { ...filtered, updatedAt: Date.now() });
+    await patchCounted(ctx, "tasks", id, { ...filtered, updatedAt: Date.now() });
   },
 });
 
@@ -141,7 +142,7 @@ export const toggleAssignee = mutation({
     const task = await ctx.db.get(args.id);
     if (!task) throw new Error("Task not found");
     const newAssignee = task.assignee === "Gregory" ? "Milton" : "Gregory";
-    await ctx.db.patch(args.id, {
+    await patchCounted(ctx, "tasks", args.id, {
       assignee: newAssignee,
       updatedAt: Date.now(),
     });
@@ -152,6 +153,6 @@ export const toggleAssignee = mutation({
 export const deleteTask = mutation({
   args: { id: v.id("tasks") },
   handler: async (ctx, args) => {
-    await ctx.db.delete(args.id);
+    await deleteCounted(ctx, "tasks", args.id);
   },
 });
@@ -6,7 +6,10 @@
  */
 import { mutation, query } from "./_generated/server";
 import { v } from "convex/values";
+import { paginationOptsValidator } from "convex/server";
+import { insertCounted, patchCounted, deleteCounted } from "./counters";
 import { QueryCtx } from "./_generated/server";
+import { Doc } from "./_generated/dataModel";
 
 // ============================================================
 // WORKFLOW ENFORCEMENT (Phase 3)
@@ -137,13 +140,50 @@ export const getWorkflowTemplates = query({
   },
 });
 
-/** Get all pending workflow steps (for daemon polling) */
+/**
+ * Get all pending workflow steps (for daemon polling).
+ * Each step is annotated with its workflow's contentType and taskId so the
+ * daemon scheduler can assign a priority class without extra round-trips.
+ */
 export const getPendingSteps = query({
   handler: async (ctx) => {
-    return await ctx.db
+    const steps = await ctx.db
       .query("workflowSteps")
       .withIndex("by_status", (q) => q.eq("status", "pending"))
       .collect();
+
+    // One workflow lookup per distinct workflow, not per step
+    const workflowCache = new Map<string, Doc<"workflows"> | null>();
+    const annotated = [];
+    for (const step of steps) {
+      const key = step.workflowId.toString();
+      if (!workflowCache.has(key)) {
+        workflowCache.set(key, await ctx.db.get(step.workflowId));
+      }
+      const workflow = workflowCache.get(key);
+      annotated.push({
+        ...step,
+        contentType: workflow?.contentType,
+        taskId: workflow?.taskId,
+      });
+    }
+    return annotated;
+  },
+});
+
+/**
+ * Get current status for a set of steps (daemon checks its in-flight steps).
+ * Deleted steps are reported as "deleted" so the daemon can abort them.
+ */
+export const getStepStatuses = query({
+  args: { stepIds: v.array(v.id("workflowSteps")) },
+  handler: async (ctx, args) => {
+    const statuses: Record<string, string> = {};
+    for (const stepId of args.stepIds) {
+      const step = await ctx.db.get(stepId);
+      statuses[stepId] = step ? step.status : "deleted";
+    }
+    return statuses;
   },
 });
 
@@ -155,22 +195,18 @@ export const getWorkflowStep = query({
   },
 });
 
-/** Get all workflows with optional status filter, sorted newest first */
+/** Get all workflows with optional status filter, sorted newest first (prefer listWorkflows for UI) */
 export const getAllWorkflows = query({
   args: { status: v.optional(v.string()) },
   handler: async (ctx, args) => {
-    let workflows;
-    if (args.status) {
-      workflows = await ctx.db
-        .query("workflows")
-        .withIndex("by_status", (q) => q.eq("status", args.status as any))
-        .collect();
-    } else {
-      workflows = await ctx.db.query("workflows").collect();
-    }
-    
-    // Sort by createdAt descending (newest first)
-    workflows.sort((a, b) => new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime());
+    // createdAt indexes return newest first without parsing dates in memory
+    const workflows = args.status
+      ? await ctx.db
+          .query("workflows")
+          .withIndex("by_status_createdAt", (q) => q.eq("status", args.status as any))
+          .order("desc")
+          .collect()
+      : await ctx.db.query("workflows").withIndex("by_createdAt").order("desc").collect();
     
     // Enrich with template and task
     const enriched = await Promise.all(
@@ -185,6 +221,40 @@ export const getAllWorkflows = query({
   },
 });
 
+/**
+ * Cursor-paginated workflows, newest first, via the createdAt indexes.
+ * Template + task enrichment is done only for the returned page.
+ */
+export const listWorkflows = query({
+  args: {
+    status: v.optional(v.string()),
+    paginationOpts: paginationOptsValidator,
+  },
+  handler: async (ctx, args) => {
+    const page = args.status
+      ? await ctx.db
+          .query("workflows")
+          .withIndex("by_status_createdAt", (q) => q.eq("status", args.status as any))
+          .order("desc")
+          .paginate(args.paginationOpts)
+      : await ctx.db
+          .query("workflows")
+          .withIndex("by_createdAt")
+          .order("desc")
+          .paginate(args.paginationOpts);
+
+    const enriched = await Promise.all(
+      page.page.map(async (w) => {
+        const template = await ctx.db.get(w.templateId);
+        const task = w.taskId ? await ctx.db.get(w.taskId) : null;
+        return { ...w, template, task };
+      })
+    );
+
+    return { ...page, page: enriched };
+  },
+});
+
 /** Get workflow by linked taskId (returns first match or null) */
 export const getWorkflowByTaskId = query({
   args: { taskId: v.id("tasks") },
@@ -304,7 +374,7 @@ export const createWorkflow = mutation({
     }[args.contentType] || args.contentType;
 
     console.log("ABOUT TO INSERT TASK");
-    const taskId = await ctx.db.insert("tasks", {
+    const taskId = await insertCounted(ctx, "tasks", {
       title: `${contentTypeLabel}: ${args.selectedAngle}`,
       description: args.briefing || "",
       status: "in_progress",
@@ -454,7 +524,7 @@ export const advanceWorkflow = mutation({
       // Update linked task to "done"
       if (workflow.taskId) {
         try {
-          await ctx.db.patch(workflow.taskId, {
+          await patchCounted(ctx, "tasks", workflow.taskId, {
             status: "done",
             updatedAt: nowTimestamp,
           });
@@ -1748,6 +1818,13 @@ export const updateStepStatus = mutation({
   },
   handler: async (ctx, args) => {
     const now = new Date().toISOString();
+    const step = await ctx.db.get(args.stepId);
+    if (!step) throw new Error("Step not found");
+    // A step skipped by cancelWorkflow must not be revived by a late daemon claim
+    if (args.status === "agent_working" && step.status === "skipped") {
+      throw new Error("Step was skipped (workflow cancelled)");
+    }
+
     const patch: Record<string, unknown> = {
       status: args.status,
       updatedAt: now,
@@ -1769,11 +1846,17 @@ export const updateStepOutput = mutation({
   args: {
     stepId: v.id("workflowSteps"),
     output: v.string(),
+    servedProvider: v.optional(v.string()),
+    servedModelId: v.optional(v.string()),
   },
   handler: async (ctx, args) => {
     const now = new Date().toISOString();
     const step = await ctx.db.get(args.stepId);
     if (!step) throw new Error("Step not found");
+    // Output from a call that finished after cancelWorkflow must not revive the step
+    if (step.status === "skipped") {
+      throw new Error("Step was skipped (workflow cancelled)");
+    }
 
     // Determine new status based on whether approval is needed
     const newStatus = step.requiresApproval ? "awaiting_review" : "completed";
@@ -1783,6 +1866,10 @@ export const updateStepOutput = mutation({
       status: newStatus,
       completedAt: now,
       updatedAt: now,
+      // Only the daemon reports the serving model; manual edits keep the recorded one
+      ...(args.servedModelId
+        ? { servedProvider: args.servedProvider, servedModelId: args.servedModelId }
+        : {}),
     });
   },
 });
@@ -1924,7 +2011,7 @@ export const deleteWorkflow = mutation({
       try {
         const task = await ctx.db.get(workflow.taskId);
         if (task) {
-          await ctx.db.delete(workflow.taskId);
+          await deleteCounted(ctx, "tasks", workflow.taskId);
         }
       } catch (err) {
         console.warn(`Failed to delete task ${workflow.taskId}:`, err);
@@ -1982,7 +2069,7 @@ export const deleteWorkflowsByStatus = mutation({
           try {
             const task = await ctx.db.get(workflow.taskId);
             if (task) {
-              await ctx.db.delete(workflow.taskId);
+              await deleteCounted(ctx, "tasks", workflow.taskId);
             }
           } catch (err) {
             console.warn(`Failed to delete task ${workflow.taskId}:`, err);
@@ -10,6 +10,7 @@ Core execution engine that:
   5. Captures output + thinking + errors
   6. Writes results back to Convex via updateStepOutput mutation
   7. Triggers advanceWorkflow to progress to next step
+  8. Serves DraftEngine suggestion requests (micro-batched LLM calls)
 
 Production daemon — runs 24/7 via launchd.
 """
@@ -18,13 +19,17 @@ import sys
 import time
 import json
 import re
+import random
 import signal
 import requests
 import traceback
+import threading
+from collections import deque
+from queue import Queue, Empty, Full
 from datetime import datetime, timezone
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from threading import Lock, Event, Thread
 
 # ============================================================
 # CONFIG
@@ -41,20 +46,195 @@ MAX_OUTPUT_CHARS = 50000   # safety cap on output size
 HEALTH_INTERVAL = 60       # seconds between health pings
 KEY_SYNC_INTERVAL = 30     # seconds between key syncs
 
+# Scheduler (step dispatch ordering)
+MAX_STEPS_PER_WORKFLOW = 2     # cap on concurrent steps from a single workflow
+SCHEDULER_AGING_SECONDS = 90   # queued time that promotes a step by one priority class
+
+# Retry policy + circuit breakers (transient provider/Convex errors)
+RETRY_MAX_ATTEMPTS = 4          # attempts per phase (1 initial + 3 retries)
+RETRY_BASE_DELAY = 2.0          # seconds — backoff is base * 2^n with full jitter
+RETRY_MAX_DELAY = 30.0          # cap on a single backoff sleep
+BREAKER_FAILURE_THRESHOLD = 5   # consecutive transient failures that open a breaker
+BREAKER_COOLDOWN = 60           # seconds an open breaker rejects calls before a trial call
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+CONVEX_RETRYABLE_STATUS_CODES = {502, 503, 504}  # Convex HTTP actions return 500 for every app error (not found, validation)
+
+# Model routing (agents with an optional routingPolicy)
+ROUTING_LATENCY_WINDOW = 50     # recent calls per model kept for p95
+ROUTING_MIN_SAMPLES = 3         # calls needed before a model's p95 is trusted
+ROUTING_WARMUP_CALLS = 3        # calls routed to a model still warming up before it must produce samples
+ROUTING_FAILURE_COOLDOWN = 600  # seconds a candidate is skipped after a non-retryable failure
+CHARS_PER_TOKEN = 4             # rough token estimate for routing rules
+
+# DraftEngine suggestion requests (second work class, micro-batched)
+SUGGESTION_POLL_INTERVAL = 2      # seconds between suggestion polls (interactive — poll fast)
+SUGGESTION_BATCH_WINDOW = 1.5     # seconds to collect compatible requests before calling the LLM
+SUGGESTION_MAX_BATCH = 8          # max requests packed into one LLM call
+SUGGESTION_WORKERS = 2            # parallel suggestion LLM calls
+SUGGESTIONS_PER_REQUEST = 5       # suggestions returned per request
+SUGGESTION_AGENT_ROLE = "de_suggestions"  # optional agent override for provider/model/prompt
+SUGGESTION_DEFAULT_PROVIDER = "anthropic"
+SUGGESTION_DEFAULT_MODEL = "claude-haiku-4-5-20251001"
+
 KEYS_FILE = Path.home() / ".config" / "mission-control" / "api-keys.json"
 LOG_PREFIX = "workflow-daemon"
 
+# Logging pipeline (queued JSON lines → rotating file)
+LOG_DIR = Path.home() / ".config" / "mission-control" / "logs"
+LOG_MAX_BYTES = 10 * 1024 * 1024   # rotate the log file at this size
+LOG_BACKUP_COUNT = 5               # rotated files kept (workflow-daemon.jsonl.1 … .5)
+LOG_QUEUE_SIZE = 10000             # records buffered for the writer; overflow is dropped, never blocks
+LOG_RING_SIZE = 500                # recent step records kept in memory (dump with SIGUSR1)
+LOG_SAMPLE_RATES = {"DEBUG": 0.1, "INFO": 0.25}  # keep-fraction for chatty (sample=True) messages
+
 # ============================================================
 # LOGGING
 # ============================================================
 
-def log(msg: str, level: str = "INFO"):
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{ts}] [{level}] {msg}", file=sys.stderr, flush=True)
+# Callers only build a dict and enqueue it; a single writer thread does all
+# formatting and I/O, so worker threads never contend on the stderr lock.
+
+_log_queue: Queue = Queue(maxsize=LOG_QUEUE_SIZE)
+_log_ring: deque = deque(maxlen=LOG_RING_SIZE)   # recent step records (full detail)
+_log_context = threading.local()                 # per-thread workflow_id for step logs
+_log_writer = None
+_log_writer_lock = Lock()
+_log_dropped = 0                                 # records lost to a full queue
+_log_dropped_lock = Lock()
+
+def _start_log_writer():
+    global _log_writer
+    with _log_writer_lock:
+        if _log_writer is None:
+            _log_writer = Thread(target=_log_writer_loop, name="log-writer", daemon=True)
+            _log_writer.start()
+
+def _open_log_file():
+    """Open the JSON log file for append. Returns None (stderr only) if unavailable."""
+    try:
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        return open(LOG_DIR / f"{LOG_PREFIX}.jsonl", "a", encoding="utf-8")
+    except OSError as e:
+        print(f"[{LOG_PREFIX}] ⚠ Cannot open log file, using stderr: {e}", file=sys.stderr, flush=True)
+        return None
+
+def _rotate_log_file(f):
+    """Size-based rotation: .jsonl → .jsonl.1 → … → .jsonl.{LOG_BACKUP_COUNT}."""
+    f.close()
+    base = LOG_DIR / f"{LOG_PREFIX}.jsonl"
+    for i in range(LOG_BACKUP_COUNT - 1, 0, -1):
+        src = base.with_name(f"{base.name}.{i}")
+        if src.exists():
+            src.replace(base.with_name(f"{base.name}.{i + 1}"))
+    if base.exists():
+        base.replace(base.with_name(f"{base.name}.1"))
+    return _open_log_file()
+
+def _log_writer_loop():
+    f = _open_log_file()
+    echo = f is None or sys.stderr.isatty()   # human-readable echo for interactive runs
+    while True:
+        record = _log_queue.get()
+        batch = [record]
+        # Drain whatever else is queued so we flush once per burst
+        while True:
+            try:
+                batch.append(_log_queue.get_nowait())
+            except Empty:
+                break
+        stop = None in batch
+        try:
+            for record in batch:
+                if record is None:
+                    continue
+                if echo:
+                    prefix = f"[step:{record['step_id'][-8:]}] " if "step_id" in record else ""
+                    print(f"[{record['ts'][:19].replace('T', ' ')}] [{record['level']}] {prefix}{record['msg']}",
+                          file=sys.stderr)
+                if f is not None:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            if echo:
+                sys.stderr.flush()
+            if f is not None:
+                f.flush()
+                if f.tell() >= LOG_MAX_BYTES:
+                    f = _rotate_log_file(f)
+        except Exception as e:
+            # Disk full, failed rename, … — never let the writer thread die (the daemon would go silent)
+            print(f"[{LOG_PREFIX}] ⚠ Log write failed, reopening log file: {e}", file=sys.stderr, flush=True)
+            if f is not None:
+                try:
+                    f.close()
+                except Exception:
+                    pass
+            f = _open_log_file()
+            echo = echo or f is None
+        if stop:
+            if f is not None:
+                f.close()
+            return
+
+def _enqueue_log(record: dict):
+    global _log_dropped
+    if _log_writer is None:
+        _start_log_writer()
+    try:
+        _log_queue.put_nowait(record)
+    except Full:
+        with _log_dropped_lock:
+            _log_dropped += 1
+
+def log(msg: str, level: str = "INFO", sample: bool = False, **fields):
+    """
+    Queue a structured log record. Never blocks on I/O.
+
+    sample=True marks a chatty message: it is kept with probability
+    LOG_SAMPLE_RATES[level] (WARN/ERROR are never sampled out).
+    Extra keyword fields (step_id, workflow_id, …) are added to the JSON line.
+    """
+    if sample and random.random() >= LOG_SAMPLE_RATES.get(level, 1.0):
+        return
+    record = {"ts": datetime.now().isoformat(timespec="milliseconds"), "level": level,
+              "msg": msg, "thread": threading.current_thread().name}
+    record.update({k: v for k, v in fields.items() if v is not None})
+    _enqueue_log(record)
+
+def log_step(step_id: str, msg: str, level: str = "INFO", sample: bool = False, tb: str = None):
+    """
+    Step-scoped log record (carries step_id + the current thread's workflow_id).
 
-def log_step(step_id: str, msg: str, level: str = "INFO"):
-    short_id = step_id[-8:] if len(step_id) > 8 else step_id
-    log(f"[step:{short_id}] {msg}", level)
+    Every step record goes to the in-memory ring buffer — including ones sampled
+    out of the file and the full traceback `tb` — so recent step history can be
+    dumped on demand without writing tracebacks inline.
+    """
+    record = {"ts": datetime.now().isoformat(timespec="milliseconds"), "level": level,
+              "msg": msg, "step_id": step_id, "workflow_id": getattr(_log_context, "workflow_id", None)}
+    _log_ring.append(dict(record, traceback=tb) if tb else record)
+    log(msg, level, sample=sample, step_id=step_id, workflow_id=record["workflow_id"])
+
+def set_log_workflow(workflow_id: str = None):
+    """Attach a workflow_id to step logs emitted from the current thread."""
+    _log_context.workflow_id = workflow_id
+
+def dump_step_logs() -> Path:
+    """Write the ring buffer of recent step logs to a timestamped JSONL file."""
+    path = LOG_DIR / f"{LOG_PREFIX}-steps-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+    records = list(_log_ring)
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    log(f"📄 Dumped {len(records)} recent step log record(s) → {path} (dropped so far: {_log_dropped})")
+    return path
+
+def shutdown_logging(timeout: float = 5.0):
+    """Flush and stop the writer thread (call last on shutdown)."""
+    if _log_writer is not None:
+        try:
+            _log_queue.put(None, timeout=timeout)
+        except Full:
+            pass
+        _log_writer.join(timeout=timeout)
 
 # ============================================================
 # JSON PARSING (ROBUST)
@@ -95,14 +275,25 @@ def extract_json_from_text(text: str):
 # ============================================================
 
 _shutdown_requested = False
+_shutdown_signal = None
 
 def _handle_signal(signum, frame):
-    global _shutdown_requested
+    # Logged by the main loop — log() takes the queue's non-reentrant lock, which
+    # the interrupted main thread may already hold
+    global _shutdown_requested, _shutdown_signal
+    _shutdown_signal = signum
     _shutdown_requested = True
-    log(f"🛑 Shutdown signal received (sig={signum})")
+
+_dump_requested = False
+
+def _handle_dump_signal(signum, frame):
+    # Handled by the main loop — don't do file I/O inside the signal handler
+    global _dump_requested
+    _dump_requested = True
 
 signal.signal(signal.SIGTERM, _handle_signal)
 signal.signal(signal.SIGINT, _handle_signal)
+signal.signal(signal.SIGUSR1, _handle_dump_signal)
 
 # ============================================================
 # API KEY MANAGEMENT
@@ -192,9 +383,14 @@ def update_step_status(step_id: str, status: str):
     """Update step status (e.g. pending → agent_working)."""
     convex_post("/api/workflow/step-status", {"stepId": step_id, "status": status})
 
-def submit_step_output(step_id: str, output: str):
-    """Submit step output. Also triggers advanceWorkflow if step doesn't need approval."""
-    convex_post("/api/workflow/step-output", {"stepId": step_id, "output": output}, timeout=30)
+def submit_step_output(step_id: str, output: str, provider: str = None, model_id: str = None):
+    """Submit step output (+ the model that served it). Also triggers advanceWorkflow if step doesn't need approval."""
+    convex_post("/api/workflow/step-output", {
+        "stepId": step_id,
+        "output": output,
+        "servedProvider": provider,
+        "servedModelId": model_id,
+    }, timeout=30)
 
 def fail_step(step_id: str, error_message: str):
     """Mark step as failed with error message."""
@@ -208,6 +404,15 @@ def fail_step(step_id: str, error_message: str):
     except Exception as e:
         log_step(step_id, f"⚠ Failed to report failure to Convex: {e}", "ERROR")
 
+def fetch_step_states(step_ids: list) -> dict:
+    """Fetch current status for in-flight steps (step_id → status, "deleted" if gone)."""
+    try:
+        resp = convex_post("/api/workflow/step-states", {"stepIds": step_ids}, timeout=10)
+        return resp.get("states", {})
+    except Exception as e:
+        log(f"⚠ Failed to fetch step states: {e}", "WARN")
+        return {}
+
 def send_thinking(step_id: str, line1: str, line2: str = ""):
     """Send live thinking/progress lines for the UI."""
     try:
@@ -229,6 +434,30 @@ def post_daemon_health(status: str, details: str = ""):
     except Exception:
         pass
 
+# ============================================================
+# CONVEX SUGGESTION API (DraftEngine wizard)
+# ============================================================
+
+def fetch_pending_suggestions(limit: int = 20) -> list:
+    """Poll Convex for pending DraftEngine suggestion requests (oldest first)."""
+    try:
+        resp = convex_post("/api/suggestions/pending", {"limit": limit}, timeout=10)
+        return resp.get("requests", [])
+    except Exception as e:
+        log(f"✗ Failed to fetch pending suggestions: {e}", "ERROR")
+        return []
+
+def complete_suggestion_request(request_id: str, suggestions: list):
+    """Store suggestions for a request (marks it completed)."""
+    convex_post("/api/suggestions/complete", {"requestId": request_id, "suggestions": suggestions})
+
+def fail_suggestion_request(request_id: str, error: str):
+    """Mark a suggestion request as failed."""
+    try:
+        convex_post("/api/suggestions/fail", {"requestId": request_id, "error": error[:500]})
+    except Exception as e:
+        log(f"⚠ Failed to report suggestion failure for {request_id[-8:]}: {e}", "ERROR")
+
 # ============================================================
 # BRAVE SEARCH (for agents that need web research)
 # ============================================================
@@ -436,6 +665,18 @@ def call_google_gemini(api_key: str, model: str, system_prompt: str, user_prompt
 
 def call_llm(provider: str, api_key: str, model: str,
              system_prompt: str, user_prompt: str) -> str:
+    """Call the correct LLM provider API, recording latency (or the failure) for model routing."""
+    start_time = time.time()
+    try:
+        text = _dispatch_llm(provider, api_key, model, system_prompt, user_prompt)
+    except Exception as e:
+        record_model_failure(provider, model, e)
+        raise
+    record_model_latency(provider, model, time.time() - start_time)
+    return text
+
+def _dispatch_llm(provider: str, api_key: str, model: str,
+                  system_prompt: str, user_prompt: str) -> str:
     """Route to the correct LLM provider API."""
     if provider == "anthropic":
         return call_anthropic(api_key, model, system_prompt, user_prompt)
@@ -454,6 +695,108 @@ def call_llm(provider: str, api_key: str, model: str,
     else:
         raise Exception(f"Unsupported LLM provider: {provider}")
 
+# ============================================================
+# MODEL ROUTING — latency- and size-aware model choice per call
+# ============================================================
+
+_model_latency: dict = {}    # (provider, model) → deque of recent call seconds
+_role_output_tokens: dict = {}  # agentRole → deque of recent output token estimates
+_model_routed: dict = {}     # (provider, model) → calls routed to it by choose_model
+_model_failed_at: dict = {}  # (provider, model) → epoch seconds of last non-retryable failure
+_routing_lock = Lock()
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // CHARS_PER_TOKEN
+
+def record_model_latency(provider: str, model: str, seconds: float):
+    with _routing_lock:
+        _model_latency.setdefault((provider, model), deque(maxlen=ROUTING_LATENCY_WINDOW)).append(seconds)
+        _model_failed_at.pop((provider, model), None)
+
+def record_model_failure(provider: str, model: str, exc: Exception):
+    """
+    A failed call counts as a worst-case (LLM_TIMEOUT) sample, so a model that
+    always fails or times out never looks fast. Non-retryable failures (bad
+    modelId, auth) also take the model out of routing for ROUTING_FAILURE_COOLDOWN.
+    """
+    with _routing_lock:
+        _model_latency.setdefault((provider, model), deque(maxlen=ROUTING_LATENCY_WINDOW)).append(
+            float(LLM_TIMEOUT))
+        if not is_retryable(exc, provider):
+            _model_failed_at[(provider, model)] = time.time()
+
+def record_role_output(agent_role: str, output: str):
+    with _routing_lock:
+        _role_output_tokens.setdefault(agent_role, deque(maxlen=ROUTING_LATENCY_WINDOW)).append(
+            estimate_tokens(output))
+
+def model_p95(provider: str, model: str):
+    """Recent p95 latency in seconds, or None until ROUTING_MIN_SAMPLES calls are seen."""
+    with _routing_lock:
+        samples = sorted(_model_latency.get((provider, model), ()))
+    if len(samples) < ROUTING_MIN_SAMPLES:
+        return None
+    return samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+def expected_output_tokens(agent_role: str, policy: dict):
+    """Policy override if set, else the recent average output size for this role (None if unknown)."""
+    if policy.get("expectedOutputTokens"):
+        return policy["expectedOutputTokens"]
+    with _routing_lock:
+        samples = list(_role_output_tokens.get(agent_role, ()))
+    return sum(samples) // len(samples) if samples else None
+
+def choose_model(agent: dict, agent_role: str, system_prompt: str, user_prompt: str) -> tuple:
+    """
+    Pick (provider, model_id, reason) for one call.
+
+    Without a routingPolicy this is the agent's pinned provider/modelId. With one,
+    a candidate qualifies if the prompt and expected output fit its token limits,
+    its recent p95 is within maxP95LatencyMs, it hasn't failed non-retryably in the
+    last ROUTING_FAILURE_COOLDOWN, its provider has an API key and its circuit isn't
+    open. The fastest qualifying candidate by p95 wins (models still warming up
+    count as fastest so they get sampled, but only for ROUTING_WARMUP_CALLS calls;
+    ties go to rank order). Falls back to the pinned model when nothing qualifies.
+    """
+    default = (agent.get("provider", "anthropic"), agent.get("modelId", "claude-haiku-4-5-20251001"))
+    policy = agent.get("routingPolicy") or {}
+    candidates = policy.get("candidates") or []
+    if not candidates:
+        return default + ("pinned",)
+
+    prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+    output_tokens = expected_output_tokens(agent_role, policy)
+    qualified = []
+    for rank, c in enumerate(candidates):
+        provider, model = c.get("provider"), c.get("modelId")
+        if not provider or not model:
+            continue
+        if c.get("maxPromptTokens") and prompt_tokens > c["maxPromptTokens"]:
+            continue
+        if c.get("maxOutputTokens") and output_tokens and output_tokens > c["maxOutputTokens"]:
+            continue
+        p95 = model_p95(provider, model)
+        if c.get("maxP95LatencyMs") and p95 is not None and p95 * 1000 > c["maxP95LatencyMs"]:
+            continue
+        with _routing_lock:
+            failed_at = _model_failed_at.get((provider, model), 0.0)
+            routed = _model_routed.get((provider, model), 0)
+        if time.time() - failed_at < ROUTING_FAILURE_COOLDOWN:
+            continue
+        if p95 is None and routed >= ROUTING_WARMUP_CALLS:
+            continue   # warm-up calls still in flight (or never reported) — don't keep favouring it
+        if not get_api_key(provider) or get_breaker(provider).state == "open":
+            continue
+        qualified.append((p95 or 0.0, rank, provider, model))
+
+    if not qualified:
+        return default + (f"fallback: no candidate fits ~{prompt_tokens} prompt tokens",)
+    p95, rank, provider, model = min(qualified)
+    with _routing_lock:
+        _model_routed[(provider, model)] = _model_routed.get((provider, model), 0) + 1
+    p95_label = f"p95={p95:.1f}s" if p95 else "warming up"
+    return provider, model, f"candidate #{rank + 1} ({p95_label}, ~{prompt_tokens} prompt tokens)"
+
 # ============================================================
 # PROMPT BUILDER
 # ============================================================
@@ -541,6 +884,365 @@ def build_user_prompt(step: dict, step_context: dict) -> str:
 
     return "\n\n".join(sections)
 
+# ============================================================
+# STEP SCHEDULER — priority classes, per-workflow fairness, aging
+# ============================================================
+
+PRIORITY_CLASSES = ("interactive", "scheduled", "batch")  # highest → lowest
+
+def _parse_iso_ts(value) -> float:
+    """Parse an ISO timestamp (as stored by Convex) to epoch seconds. 0.0 if unparseable."""
+    if not value or not isinstance(value, str):
+        return 0.0
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+def classify_step(step: dict) -> str:
+    """
+    Assign a priority class to a pending step:
+      - interactive: DraftEngine wizard flows (a user is waiting on screen)
+      - scheduled:   Task Board content workflows (linked task)
+      - batch:       everything else
+    """
+    if step.get("contentType") == "draftengine_blog" or step.get("agentRole", "").startswith("de_"):
+        return "interactive"
+    if step.get("taskId"):
+        return "scheduled"
+    return "batch"
+
+class StepScheduler:
+    """
+    Orders pending steps for dispatch instead of taking them in Convex order.
+
+    Each pick takes the step with the best (effective class, workflow load, deadline):
+      - effective class = priority class, promoted one level per
+        SCHEDULER_AGING_SECONDS queued so batch work cannot starve
+      - workflow load = steps of that workflow already running or picked this round,
+        so one workflow can't take every slot (capped at MAX_STEPS_PER_WORKFLOW)
+      - deadline = time it became pending (updatedAt) + timeoutMinutes (earliest first)
+
+    Also records per-class queue wait times for health reporting.
+    """
+
+    def __init__(self):
+        self._first_seen: dict = {}   # step_id → epoch seconds first seen pending
+        self._lock = Lock()
+        self._wait_stats = {c: {"count": 0, "total": 0.0, "max": 0.0} for c in PRIORITY_CLASSES}
+
+    def _enqueued_at(self, step: dict) -> float:
+        # updatedAt is stamped on every transition to pending (retry/reject/review
+        # reset keep the original createdAt), so it measures time spent queued
+        pending_since = _parse_iso_ts(step.get("updatedAt")) or _parse_iso_ts(step.get("createdAt"))
+        return pending_since or self._first_seen.get(step["_id"], time.time())
+
+    def _sort_key(self, step: dict, now: float, workflow_load: dict) -> tuple:
+        enqueued = self._enqueued_at(step)
+        rank = PRIORITY_CLASSES.index(classify_step(step))
+        promoted = int(max(0.0, now - enqueued) // SCHEDULER_AGING_SECONDS)
+        deadline = enqueued + float(step.get("timeoutMinutes") or 0) * 60 if enqueued else float("inf")
+        return (max(0, rank - promoted), workflow_load.get(step.get("workflowId"), 0), deadline)
+
+    def select(self, pending: list, slots: int, active_steps: dict) -> list:
+        """Pick up to `slots` steps from `pending`, given currently running steps (step_id → step)."""
+        now = time.time()
+        with self._lock:
+            pending_ids = {s["_id"] for s in pending}
+            for step_id in pending_ids:
+                self._first_seen.setdefault(step_id, now)
+            # Forget steps that are no longer pending (claimed elsewhere, skipped, deleted)
+            for step_id in list(self._first_seen):
+                if step_id not in pending_ids:
+                    del self._first_seen[step_id]
+
+            workflow_load: dict = {}
+            for step in active_steps.values():
+                wf = step.get("workflowId")
+                workflow_load[wf] = workflow_load.get(wf, 0) + 1
+
+            candidates = [s for s in pending if s["_id"] not in active_steps]
+            batch = []
+            while candidates and len(batch) < slots:
+                eligible = [s for s in candidates
+                            if workflow_load.get(s.get("workflowId"), 0) < MAX_STEPS_PER_WORKFLOW]
+                if not eligible:
+                    break
+                best = min(eligible, key=lambda s: self._sort_key(s, now, workflow_load))
+                candidates.remove(best)
+                batch.append(best)
+                wf = best.get("workflowId")
+                workflow_load[wf] = workflow_load.get(wf, 0) + 1
+            return batch
+
+    def record_dispatch(self, step: dict) -> float:
+        """Record queue wait for a dispatched step. Returns wait in seconds."""
+        with self._lock:
+            wait = max(0.0, time.time() - self._enqueued_at(step))
+            self._first_seen.pop(step["_id"], None)
+            stats = self._wait_stats[classify_step(step)]
+            stats["count"] += 1
+            stats["total"] += wait
+            stats["max"] = max(stats["max"], wait)
+            return wait
+
+    def wait_summary(self) -> str:
+        """Compact per-class wait summary for health pings, e.g. 'interactive=3/4.1s/9.0s'."""
+        with self._lock:
+            parts = []
+            for cls in PRIORITY_CLASSES:
+                stats = self._wait_stats[cls]
+                if stats["count"]:
+                    avg = stats["total"] / stats["count"]
+                    parts.append(f"{cls}={stats['count']}/{avg:.1f}s/{stats['max']:.1f}s")
+            return " ".join(parts) or "none"
+
+# ============================================================
+# CANCELLATION — abort in-flight steps for cancelled/deleted workflows
+# ============================================================
+
+CANCELLED_STEP_STATES = ("skipped", "deleted")
+
+class StepCancelled(Exception):
+    """Raised inside execute_step when the step's workflow was cancelled or deleted."""
+
+_cancel_events: dict = {}   # step_id → Event, for steps dispatched (queued or executing)
+_cancel_lock = Lock()
+_cancel_stats = {"count": 0, "seconds": 0.0, "tokens": 0}
+
+def register_step(step_id: str) -> Event:
+    """Create the step's cancel Event — at dispatch, so a step still queued can be cancelled."""
+    with _cancel_lock:
+        return _cancel_events.setdefault(step_id, Event())
+
+def unregister_step(step_id: str):
+    with _cancel_lock:
+        _cancel_events.pop(step_id, None)
+
+def cancel_step(step_id: str) -> bool:
+    """Signal a dispatched step to abort. Returns False if it isn't dispatched."""
+    with _cancel_lock:
+        event = _cancel_events.get(step_id)
+    if event is None:
+        return False
+    event.set()
+    return True
+
+def check_cancelled(step_id: str):
+    """Raise StepCancelled if the step has been signalled to abort."""
+    with _cancel_lock:
+        event = _cancel_events.get(step_id)
+    if event is not None and event.is_set():
+        raise StepCancelled(step_id)
+
+def raise_if_cancelled_remotely(step_id: str):
+    """After Convex refuses a claim/submit, raise StepCancelled if the step was skipped or deleted meanwhile."""
+    if fetch_step_states([step_id]).get(step_id) in CANCELLED_STEP_STATES:
+        raise StepCancelled(step_id)
+
+def record_cancellation(seconds: float, tokens: int):
+    """Account wasted worker time and (estimated) prompt tokens from a cancelled step."""
+    with _cancel_lock:
+        _cancel_stats["count"] += 1
+        _cancel_stats["seconds"] += seconds
+        _cancel_stats["tokens"] += tokens
+
+def cancellation_summary() -> str:
+    with _cancel_lock:
+        return (f"cancelled={_cancel_stats['count']} "
+                f"wasted={_cancel_stats['seconds']:.0f}s/~{_cancel_stats['tokens']}tok")
+
+def run_cancellable(step_id: str, fn, *args):
+    """
+    Run a blocking call (e.g. an LLM request) on a helper thread and wait for it,
+    returning early with StepCancelled if the step is cancelled meanwhile.
+
+    requests can't interrupt a blocked read, so an abandoned call finishes on its
+    helper thread and its result is discarded — but the worker slot is freed at once.
+    """
+    result: dict = {}
+    done = Event()
+
+    def _target():
+        try:
+            result["value"] = fn(*args)
+        except BaseException as e:
+            result["error"] = e
+        finally:
+            done.set()
+
+    with _cancel_lock:
+        cancel_event = _cancel_events.get(step_id) or Event()
+    Thread(target=_target, name=f"call-{step_id[-8:]}", daemon=True).start()
+    while not done.wait(0.5):
+        if cancel_event.is_set():
+            raise StepCancelled(step_id)
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+# ============================================================
+# RETRY POLICY + CIRCUIT BREAKERS
+# ============================================================
+
+class CircuitOpen(Exception):
+    """Raised when a call is refused because the target's breaker is open."""
+
+class CircuitBreaker:
+    """
+    Per-target breaker (one per LLM provider, plus "convex").
+
+    closed → open after BREAKER_FAILURE_THRESHOLD consecutive transient failures;
+    open → half_open once BREAKER_COOLDOWN has passed (one trial call allowed);
+    half_open → closed on success, back to open on failure. A trial that ends
+    without a verdict (e.g. cancelled) is released so the next call can retry it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_started_at = 0.0
+        self._lock = Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open" and time.time() - self.opened_at >= BREAKER_COOLDOWN:
+                self.state = "half_open"
+                self.trial_started_at = time.time()
+                return True
+            return self.state == "closed"
+
+    def retry_after(self) -> float:
+        """Seconds until a call may get through (open: cooldown left; half_open: wait on the trial)."""
+        with self._lock:
+            now = time.time()
+            if self.state == "open":
+                return max(0.0, BREAKER_COOLDOWN - (now - self.opened_at))
+            if self.state == "half_open":
+                return max(1.0, BREAKER_COOLDOWN - (now - self.trial_started_at))
+            return 0.0
+
+    def release_trial(self):
+        """A half-open trial ended without a verdict — back to open with the cooldown already served."""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                log(f"🟢 Circuit closed: {self.name}")
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or (
+                    self.state == "closed" and self.failures >= BREAKER_FAILURE_THRESHOLD):
+                self.state = "open"
+                self.opened_at = time.time()
+                log(f"🔴 Circuit open: {self.name} ({self.failures} consecutive failures)", "WARN")
+
+_breakers: dict = {}
+_breakers_lock = Lock()
+_retry_stats = {"retries": 0, "recovered": 0, "exhausted": 0}
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+def is_retryable(exc: Exception, target: str = None) -> bool:
+    """
+    Transient errors (timeouts, dropped connections, 429/5xx) are retryable; all else is fatal.
+    For target "convex" only gateway errors count — a 500 there is a permanent app error.
+    """
+    if isinstance(exc, CircuitOpen):
+        return True
+    if isinstance(exc, requests.exceptions.HTTPError):
+        status = exc.response.status_code if exc.response is not None else None
+        codes = CONVEX_RETRYABLE_STATUS_CODES if target == "convex" else RETRYABLE_STATUS_CODES
+        return status in codes
+    return isinstance(exc, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+
+def with_retry(phase: str, fn, *args, deadline: float, breaker: str = None, step_id: str = None):
+    """
+    Run one phase of work, retrying retryable errors with jittered exponential
+    backoff until RETRY_MAX_ATTEMPTS or `deadline` (epoch seconds) is reached.
+
+    Only this phase is re-run, so earlier work (config, prompt, search) is kept.
+    If `breaker` is set, calls are refused while that target's circuit is open;
+    any HTTP response — even a non-retryable app error — counts as the target being up.
+    Backoff sleeps are interrupted by step cancellation.
+    """
+    cb = get_breaker(breaker) if breaker else None
+    attempt = 0
+    while True:
+        attempt += 1
+        called = False    # fn ran, so the breaker needs a verdict
+        verdict = False
+        try:
+            if cb and not cb.allow():
+                raise CircuitOpen(f"Circuit open for '{breaker}' (retry in {cb.retry_after():.0f}s)")
+            called = True
+            result = fn(*args)
+            if cb:
+                verdict = True
+                cb.record_success()
+            if attempt > 1:
+                with _breakers_lock:
+                    _retry_stats["recovered"] += 1
+            return result
+        except Exception as e:
+            # Non-retryable errors propagate without counting toward the breaker
+            if not is_retryable(e, breaker):
+                if cb and called and isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+                    verdict = True
+                    cb.record_success()
+                raise
+            if cb and called:
+                verdict = True
+                cb.record_failure()
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+            if isinstance(e, CircuitOpen):
+                delay = max(delay, cb.retry_after())
+            if attempt >= RETRY_MAX_ATTEMPTS or time.time() + delay >= deadline or _shutdown_requested:
+                with _breakers_lock:
+                    _retry_stats["exhausted"] += 1
+                raise
+            with _breakers_lock:
+                _retry_stats["retries"] += 1
+            msg = f"↻ {phase} failed ({type(e).__name__}: {str(e)[:120]}) — retry {attempt}/{RETRY_MAX_ATTEMPTS - 1} in {delay:.1f}s"
+            if step_id:
+                log_step(step_id, msg, "WARN")
+                with _cancel_lock:
+                    cancel_event = _cancel_events.get(step_id)
+                if cancel_event is not None:
+                    cancel_event.wait(delay)
+                else:
+                    time.sleep(delay)
+                check_cancelled(step_id)
+            else:
+                log(msg, "WARN")
+                time.sleep(delay)
+        finally:
+            # Never leave a half-open breaker waiting on a trial that ended without a verdict
+            if cb and called and not verdict:
+                cb.release_trial()
+
+def retry_summary() -> str:
+    """Retry counters + any non-closed breakers, for health pings."""
+    with _breakers_lock:
+        stats = dict(_retry_stats)
+        breakers = list(_breakers.values())
+    tripped = [f"{b.name}:{b.state}" for b in breakers if b.state != "closed"]
+    return (f"retries={stats['retries']} recovered={stats['recovered']} exhausted={stats['exhausted']} "
+            f"breakers={','.join(tripped) or 'all closed'}")
+
 # ============================================================
 # STEP EXECUTOR — Core execution logic for a single step
 # ============================================================
@@ -563,18 +1265,35 @@ def execute_step(step: dict) -> None:
     step_num = step.get("stepNumber", 0)
     workflow_id = step.get("workflowId", "?")
 
+    set_log_workflow(workflow_id)
     log_step(step_id, f"▶ Starting: '{step_name}' (role={agent_role}, step={step_num})")
 
+    register_step(step_id)   # normally already created at dispatch
+    step_start = time.time()
+    # Retries must finish within the step's own timeout
+    deadline = step_start + float(step.get("timeoutMinutes") or 10) * 60
+    prompt_chars = 0   # set once an LLM call is in flight (for wasted-token accounting)
+
     try:
         # ---- 1. Claim the step ----
+        check_cancelled(step_id)   # cancelled while queued in the executor
         send_thinking(step_id, f"🔄 Starting {step_name}...", "Claiming step...")
-        update_step_status(step_id, "agent_working")
-        log_step(step_id, "Status → agent_working")
+        try:
+            with_retry("claim", update_step_status, step_id, "agent_working",
+                       deadline=deadline, breaker="convex", step_id=step_id)
+        except requests.exceptions.HTTPError:
+            # Convex refuses to claim a step skipped since it was polled — don't mark it failed
+            raise_if_cancelled_remotely(step_id)
+            raise
+        log_step(step_id, "Status → agent_working", sample=True)
 
         # ---- 2. Fetch agent config ----
         send_thinking(step_id, f"🤖 Loading agent config for '{agent_role}'...", "")
         try:
-            agent = fetch_agent_config(agent_role)
+            agent = with_retry("agent config", fetch_agent_config, agent_role,
+                               deadline=deadline, breaker="convex", step_id=step_id)
+        except StepCancelled:
+            raise
         except Exception as e:
             raise Exception(
                 f"No agent configured for role '{agent_role}'. "
@@ -587,22 +1306,19 @@ def execute_step(step: dict) -> None:
         system_prompt = agent.get("systemPrompt", "")
         agent_name = agent.get("name", agent_role)
 
-        log_step(step_id, f"Agent: {agent_name} | Provider: {provider} | Model: {model_id}")
+        log_step(step_id, f"Agent: {agent_name} | Provider: {provider} | Model: {model_id}"
+                          f"{' | routing policy' if agent.get('routingPolicy') else ''}")
         send_thinking(step_id,
                        f"🤖 Agent: {agent_name}",
                        f"Model: {model_id} ({provider})")
 
-        # ---- 3. Get API key ----
-        api_key = get_api_key(provider)
-        if not api_key:
-            raise Exception(
-                f"No API key configured for provider '{provider}'. "
-                f"Set it in Mission Control → Settings → API Keys."
-            )
-
-        # ---- 4. Fetch step context (workflow metadata) ----
+        # ---- 3. Fetch step context (workflow metadata) ----
+        check_cancelled(step_id)
         try:
-            step_context = fetch_step_context(step_id)
+            step_context = with_retry("step context", fetch_step_context, step_id,
+                                      deadline=deadline, breaker="convex", step_id=step_id)
+        except StepCancelled:
+            raise
         except Exception:
             # If context fetch fails, use what we have from the step itself
             step_context = {
@@ -611,12 +1327,23 @@ def execute_step(step: dict) -> None:
                 "briefing": "",
             }
 
-        # ---- 5. Build prompt ----
+        # ---- 4. Build prompt (may run a web search) ----
+        check_cancelled(step_id)
         send_thinking(step_id,
                        f"📝 Building prompt for {agent_name}...",
                        "Assembling input data + web research...")
         user_prompt = build_user_prompt(step, step_context)
-        log_step(step_id, f"Prompt built: {len(user_prompt)} chars")
+        log_step(step_id, f"Prompt built: {len(user_prompt)} chars", sample=True)
+
+        # ---- 5. Route to a model + get API key ----
+        provider, model_id, route_reason = choose_model(agent, agent_role, system_prompt, user_prompt)
+        log_step(step_id, f"Routed → {provider}/{model_id} ({route_reason})")
+        api_key = get_api_key(provider)
+        if not api_key:
+            raise Exception(
+                f"No API key configured for provider '{provider}'. "
+                f"Set it in Mission Control → Settings → API Keys."
+            )
 
         # ---- 6. Call LLM ----
         send_thinking(step_id,
@@ -624,11 +1351,16 @@ def execute_step(step: dict) -> None:
                        f"Provider: {provider} | Waiting for response...")
         log_step(step_id, f"→ Calling {provider}/{model_id}...")
 
+        check_cancelled(step_id)
+        prompt_chars = len(system_prompt or "") + len(user_prompt)
         start_time = time.time()
-        raw_output = call_llm(provider, api_key, model_id, system_prompt, user_prompt)
+        raw_output = with_retry("LLM call", run_cancellable, step_id, call_llm,
+                                provider, api_key, model_id, system_prompt, user_prompt,
+                                deadline=deadline, breaker=provider, step_id=step_id)
         elapsed = time.time() - start_time
 
         log_step(step_id, f"✅ LLM returned {len(raw_output)} chars in {elapsed:.1f}s")
+        record_role_output(agent_role, raw_output)
         send_thinking(step_id,
                        f"✅ Response received ({len(raw_output)} chars)",
                        f"Processing output...")
@@ -657,16 +1389,32 @@ def execute_step(step: dict) -> None:
                 })
 
         # ---- 8. Submit output ----
+        check_cancelled(step_id)
         send_thinking(step_id,
                        f"💾 Saving output...",
                        "Submitting to workflow engine...")
-        submit_step_output(step_id, output_to_store)
-
-        log_step(step_id, f"✅ Step complete! Output submitted ({len(output_to_store)} chars)")
+        try:
+            with_retry("submit output", submit_step_output, step_id, output_to_store, provider, model_id,
+                       deadline=deadline, breaker="convex", step_id=step_id)
+        except requests.exceptions.HTTPError:
+            # Cancelled after the last feed check — Convex refuses output for a skipped step
+            raise_if_cancelled_remotely(step_id)
+            raise
+
+        log_step(step_id, f"✅ Step complete! Output submitted ({len(output_to_store)} chars, "
+                          f"served by {provider}/{model_id})")
         send_thinking(step_id,
                        f"✅ {step_name} complete!",
                        f"{len(output_to_store)} chars | {elapsed:.1f}s")
 
+    except StepCancelled:
+        wasted = time.time() - step_start
+        # Rough token estimate (~4 chars/token) for a prompt already sent to the provider
+        wasted_tokens = prompt_chars // 4
+        record_cancellation(wasted, wasted_tokens)
+        log_step(step_id, f"⏹ Cancelled — workflow cancelled/deleted "
+                          f"(wasted {wasted:.1f}s, ~{wasted_tokens} prompt tokens)", "WARN")
+
     except requests.exceptions.HTTPError as e:
         status_code = e.response.status_code if e.response is not None else "?"
         try:
@@ -680,6 +1428,12 @@ def execute_step(step: dict) -> None:
         send_thinking(step_id, f"❌ Failed: HTTP {status_code}", error_msg[:100])
         fail_step(step_id, error_msg)
 
+    except CircuitOpen as e:
+        error_msg = str(e)
+        log_step(step_id, f"✗ {error_msg}", "ERROR")
+        send_thinking(step_id, "❌ Provider unavailable", error_msg[:100])
+        fail_step(step_id, error_msg)
+
     except requests.exceptions.Timeout:
         error_msg = f"LLM API timeout ({LLM_TIMEOUT}s)"
         log_step(step_id, f"✗ {error_msg}", "ERROR")
@@ -689,32 +1443,209 @@ def execute_step(step: dict) -> None:
     except Exception as e:
         error_msg = f"{type(e).__name__}: {str(e)[:500]}"
         log_step(step_id, f"✗ {error_msg}", "ERROR")
-        log_step(step_id, traceback.format_exc()[:1000], "DEBUG")
+        log_step(step_id, "Traceback captured (SIGUSR1 dumps recent step logs)", "DEBUG",
+                 tb=traceback.format_exc())
         send_thinking(step_id, "❌ Failed", str(e)[:100])
         fail_step(step_id, error_msg)
 
+    finally:
+        unregister_step(step_id)
+        set_log_workflow(None)
+
+# ============================================================
+# SUGGESTION PROCESSOR — micro-batched DraftEngine suggestions
+# ============================================================
+
+SUGGESTION_SYSTEM_PROMPT = (
+    "You are DraftEngine's suggestion assistant. You answer several independent "
+    "requests at once and return strictly structured JSON."
+)
+
+SUGGESTION_TASKS = {
+    "topic": ("sector", "specific, timely blog post topic ideas for a business in this sector"),
+    "scene": ("headline", "concise visual scene descriptions for the hero image of a blog post with this headline"),
+}
+
+def build_suggestion_prompt(req_type: str, batch: list) -> str:
+    """Pack a batch of same-type requests into one prompt with per-item structured output."""
+    field, task = SUGGESTION_TASKS[req_type]
+    items = "\n".join(f"{i}. {field}: {req.get(field, '')}" for i, req in enumerate(batch, 1))
+    sections = [
+        f"## Task\nFor EACH item below, write {SUGGESTIONS_PER_REQUEST} {task}.",
+        f"## Items\n{items}",
+    ]
+    sections.append(
+        "## Output Format\n"
+        "Return ONLY valid JSON, no markdown, in exactly this shape:\n"
+        '{"items": [{"item": 1, "suggestions": ["...", "..."]}, ...]}\n'
+        "Include one entry per item number."
+    )
+    return "\n\n".join(sections)
+
+def split_suggestion_output(raw_output: str, batch: list) -> dict:
+    """Map item number → suggestions list from a batched LLM response."""
+    parsed = extract_json_from_text(raw_output)
+    items = parsed.get("items", []) if isinstance(parsed, dict) else parsed
+    results = {}
+    for entry in items or []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            idx = int(entry.get("item"))
+        except (TypeError, ValueError):
+            continue
+        raw = entry.get("suggestions")
+        if not isinstance(raw, list):
+            continue   # e.g. a bare string — treat the item as missing so the request is failed
+        suggestions = [str(x).strip() for x in raw if str(x).strip()]
+        if 1 <= idx <= len(batch) and suggestions:
+            results[idx] = suggestions[:SUGGESTIONS_PER_REQUEST]
+    return results
+
+class SuggestionProcessor:
+    """
+    Background loop that serves /api/suggestions/* alongside workflow steps.
+
+    Pending requests are collected for up to SUGGESTION_BATCH_WINDOW seconds,
+    grouped by type, and packed (up to SUGGESTION_MAX_BATCH) into one LLM call.
+    The structured response is split back out into per-request complete/fail calls.
+    Runs on its own small pool so suggestions never queue behind long steps.
+    """
+
+    def __init__(self):
+        self._inflight: set = set()
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=SUGGESTION_WORKERS, thread_name_prefix="suggest")
+        self.stats = {"requests": 0, "failed": 0, "calls": 0}
+
+    def summary(self) -> str:
+        with self._lock:
+            calls = self.stats["calls"]
+            per_call = self.stats["requests"] / calls if calls else 0.0
+            return (f"suggestions ok={self.stats['requests']} err={self.stats['failed']} "
+                    f"calls={calls} ({per_call:.1f}/call)")
+
+    def _fresh(self, pending: list) -> list:
+        with self._lock:
+            return [r for r in pending if r["_id"] not in self._inflight]
+
+    def _resolve_model(self) -> tuple:
+        """Provider, model and system prompt — from the suggestion agent if configured."""
+        try:
+            agent = fetch_agent_config(SUGGESTION_AGENT_ROLE)
+            return (agent.get("provider") or SUGGESTION_DEFAULT_PROVIDER,
+                    agent.get("modelId") or SUGGESTION_DEFAULT_MODEL,
+                    agent.get("systemPrompt") or SUGGESTION_SYSTEM_PROMPT)
+        except Exception:
+            return SUGGESTION_DEFAULT_PROVIDER, SUGGESTION_DEFAULT_MODEL, SUGGESTION_SYSTEM_PROMPT
+
+    def _process_batch(self, req_type: str, batch: list):
+        ids = [r["_id"] for r in batch]
+        try:
+            provider, model_id, system_prompt = self._resolve_model()
+            api_key = get_api_key(provider)
+            if not api_key:
+                raise Exception(f"No API key configured for provider '{provider}'")
+
+            start_time = time.time()
+            raw_output = with_retry(f"{req_type} suggestions", call_llm,
+                                    provider, api_key, model_id, system_prompt,
+                                    build_suggestion_prompt(req_type, batch),
+                                    deadline=time.time() + LLM_TIMEOUT, breaker=provider)
+            results = split_suggestion_output(raw_output, batch)
+            log(f"💡 {req_type} suggestions: {len(results)}/{len(batch)} from one "
+                f"{provider}/{model_id} call in {time.time() - start_time:.1f}s")
+
+            ok = 0
+            for idx, req in enumerate(batch, 1):
+                if idx in results:
+                    try:
+                        complete_suggestion_request(req["_id"], results[idx])
+                        ok += 1
+                        continue
+                    except Exception as e:
+                        error = f"Failed to store suggestions: {e}"
+                else:
+                    error = "No suggestions returned for this request"
+                fail_suggestion_request(req["_id"], error)
+            with self._lock:
+                self.stats["calls"] += 1
+                self.stats["requests"] += ok
+                self.stats["failed"] += len(batch) - ok
+
+        except Exception as e:
+            error_msg = f"{type(e).__name__}: {str(e)[:300]}"
+            log(f"✗ {req_type} suggestion batch ({len(batch)}) failed: {error_msg}", "ERROR")
+            for req in batch:
+                fail_suggestion_request(req["_id"], error_msg)
+            with self._lock:
+                self.stats["failed"] += len(batch)
+        finally:
+            with self._lock:
+                self._inflight.difference_update(ids)
+
+    def _dispatch(self, fresh: list):
+        by_type: dict = {}
+        for req in fresh:
+            if req.get("type") in SUGGESTION_TASKS:
+                by_type.setdefault(req["type"], []).append(req)
+            else:
+                fail_suggestion_request(req["_id"], f"Unsupported suggestion type: {req.get('type')}")
+        for req_type, reqs in by_type.items():
+            for i in range(0, len(reqs), SUGGESTION_MAX_BATCH):
+                batch = reqs[i:i + SUGGESTION_MAX_BATCH]
+                with self._lock:
+                    self._inflight.update(r["_id"] for r in batch)
+                self._executor.submit(self._process_batch, req_type, batch)
+
+    def run(self):
+        log(f"💡 Suggestion processor started (window={SUGGESTION_BATCH_WINDOW}s "
+            f"max_batch={SUGGESTION_MAX_BATCH})")
+        while not _shutdown_requested:
+            try:
+                fresh = self._fresh(fetch_pending_suggestions(limit=SUGGESTION_MAX_BATCH * 4))
+                if fresh:
+                    # Hold the batch open until the oldest request is SUGGESTION_BATCH_WINDOW old
+                    oldest = min(r.get("createdAt", 0) for r in fresh) / 1000.0
+                    hold = SUGGESTION_BATCH_WINDOW - (time.time() - oldest)
+                    if hold > 0:
+                        time.sleep(min(hold, SUGGESTION_BATCH_WINDOW))
+                        fresh = self._fresh(fetch_pending_suggestions(limit=SUGGESTION_MAX_BATCH * 4)) or fresh
+                    self._dispatch(fresh)
+            except Exception as e:
+                log(f"✗ Suggestion loop error: {e}", "ERROR")
+            time.sleep(SUGGESTION_POLL_INTERVAL)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
 # ============================================================
 # MAIN POLLING LOOP
 # ============================================================
 
 def run_daemon():
     """Main daemon loop with proper concurrent step management."""
+    global _dump_requested
     log("=" * 70)
     log("🚀 ISTK Workflow Daemon v1.0 starting")
     log(f"   Convex: {CONVEX_SITE_URL}")
     log(f"   Poll interval: {POLL_INTERVAL}s")
-    log(f"   Max concurrent: {MAX_CONCURRENT_STEPS}")
+    log(f"   Max concurrent: {MAX_CONCURRENT_STEPS} (per workflow: {MAX_STEPS_PER_WORKFLOW})")
     log(f"   LLM timeout: {LLM_TIMEOUT}s")
     log(f"   Keys file: {KEYS_FILE}")
+    log(f"   Log file: {LOG_DIR / (LOG_PREFIX + '.jsonl')} (SIGUSR1 dumps recent step logs)")
     log("=" * 70)
 
     # Initial key load
     load_api_keys()
     log(f"🔑 Loaded {len(_keys_cache)} API key(s): {list(_keys_cache.keys())}")
 
-    # Track active step futures (step_id → future)
+    # Track active step futures (step_id → future) and their step dicts (for scheduling)
     active_futures: dict = {}
+    active_steps: dict = {}
+    aborting: set = set()   # cancelled steps whose worker hasn't returned yet (still hold a slot)
     active_lock = Lock()
+    scheduler = StepScheduler()
 
     last_health_ping = 0
     last_key_sync = 0
@@ -724,6 +1655,9 @@ def run_daemon():
     post_daemon_health("online", "Workflow daemon started")
 
     executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_STEPS, thread_name_prefix="step")
+    suggestions = SuggestionProcessor()
+    suggestion_thread = Thread(target=suggestions.run, name="suggestions", daemon=True)
+    suggestion_thread.start()
 
     try:
         while not _shutdown_requested:
@@ -743,12 +1677,32 @@ def run_daemon():
                             log(f"✗ Unhandled error in step {step_id[-8:]}: {e}", "ERROR")
                 for step_id in completed_ids:
                     del active_futures[step_id]
-                active_count = len(active_futures)
+                    active_steps.pop(step_id, None)
+                    aborting.discard(step_id)
+                active_ids = list(active_futures.keys())
+
+            # ---- Cancellation feed: abort steps whose workflow was cancelled/deleted ----
+            if active_ids:
+                states = fetch_step_states(active_ids)
+                with active_lock:
+                    for step_id in active_ids:
+                        if (states.get(step_id) in CANCELLED_STEP_STATES and step_id not in aborting
+                                and cancel_step(step_id)):
+                            log_step(step_id, f"⏹ Aborting in-flight step ({states[step_id]})", "WARN")
+                            # The slot stays counted until the worker returns — it may be mid-search
+                            # or mid-submit rather than in an interruptible wait
+                            aborting.add(step_id)
+                    active_count = len(active_futures)
+            else:
+                active_count = 0
 
             # ---- Health ping ----
             if now - last_health_ping >= HEALTH_INTERVAL:
                 post_daemon_health("online",
-                    f"Running | ok={total_processed} err={total_failed} active={active_count}")
+                    f"Running | ok={total_processed} err={total_failed} active={active_count} "
+                    f"aborting={len(aborting)} "
+                    f"| wait(n/avg/max) {scheduler.wait_summary()} | {cancellation_summary()} "
+                    f"| {suggestions.summary()} | {retry_summary()}")
                 last_health_ping = now
 
             # ---- Key sync ----
@@ -764,9 +1718,10 @@ def run_daemon():
                     active_ids = set(active_futures.keys())
                     new_steps = [s for s in pending if s["_id"] not in active_ids]
                     slots_available = MAX_CONCURRENT_STEPS - len(active_futures)
+                    batch = scheduler.select(pending, slots_available, dict(active_steps)) \
+                        if new_steps and slots_available > 0 else []
 
-                if new_steps and slots_available > 0:
-                    batch = new_steps[:slots_available]
+                if batch:
                     log(f"📋 Dispatching {len(batch)} step(s) "
                         f"(pending={len(pending)} new={len(new_steps)} "
                         f"active={active_count} slots={slots_available})")
@@ -776,22 +1731,38 @@ def run_daemon():
                         with active_lock:
                             if step_id in active_futures:
                                 continue
+                            wait = scheduler.record_dispatch(step)
+                            log_step(step_id, f"Scheduled ({classify_step(step)}, waited {wait:.1f}s)",
+                                     sample=True)
+                            register_step(step_id)
                             future = executor.submit(execute_step, step)
                             active_futures[step_id] = future
+                            active_steps[step_id] = step
 
             # ---- Sleep (interruptible) ----
             sleep_remaining = POLL_INTERVAL
             while sleep_remaining > 0 and not _shutdown_requested:
+                if _dump_requested:
+                    _dump_requested = False
+                    try:
+                        dump_step_logs()
+                    except OSError as e:
+                        log(f"⚠ Step log dump failed: {e}", "WARN")
                 time.sleep(min(1.0, sleep_remaining))
                 sleep_remaining -= 1.0
 
     except KeyboardInterrupt:
         log("🛑 Keyboard interrupt")
     finally:
+        if _shutdown_signal is not None:
+            log(f"🛑 Shutdown signal received (sig={_shutdown_signal})")
         log("🛑 Shutting down...")
         post_daemon_health("offline", "Workflow daemon stopped")
         executor.shutdown(wait=True, cancel_futures=True)
+        suggestion_thread.join(timeout=SUGGESTION_POLL_INTERVAL + SUGGESTION_BATCH_WINDOW)
+        suggestions.shutdown()
         log(f"🛑 Daemon stopped (processed={total_processed} failed={total_failed})")
+        shutdown_logging()
 
 # ============================================================
 # ENTRYPOINT
@@ -2,7 +2,7 @@
 
 import { useState } from "react";
 import Link from "next/link";
-import { useQuery, useMutation } from "convex/react";
+import { usePaginatedQuery, useMutation } from "convex/react";
 import { api } from "../../../convex/_generated/api";
 import { Clock, Trash2 } from "lucide-react";
 import WorkflowProgress from "@/components/workflows/WorkflowProgress";
@@ -41,6 +41,8 @@ function timeAgo(isoString: string): string {
   return `${Math.floor(seconds / 86400)}d ago`;
 }
 
+const PAGE_SIZE = 20;
+
 export default function WorkflowsPage() {
   const [selectedStatus, setSelectedStatus] = useState<WorkflowStatus>("all");
   const [isDeleting, setIsDeleting] = useState(false);
@@ -52,9 +54,16 @@ export default function WorkflowsPage() {
   const [pendingAction, setPendingAction] = useState<"delete-workflow" | "clear-all" | null>(null);
   const [pendingWorkflowId, setPendingWorkflowId] = useState<string | null>(null);
 
-  const workflows = useQuery(api.workflows.getAllWorkflows, {
-    status: selectedStatus === "all" ? undefined : selectedStatus,
-  });
+  const {
+    results: workflows,
+    status: paginationStatus,
+    loadMore,
+  } = usePaginatedQuery(
+    api.workflows.listWorkflows,
+    { status: selectedStatus === "all" ? undefined : selectedStatus },
+    { initialNumItems: PAGE_SIZE }
+  );
+  const canLoadMore = paginationStatus === "CanLoadMore";
 
   const deleteWorkflow = useMutation(api.workflows.deleteWorkflow);
   const deleteWorkflowsByStatus = useMutation(api.workflows.deleteWorkflowsByStatus);
@@ -107,7 +116,7 @@ export default function WorkflowsPage() {
     }
   };
 
-  if (workflows === undefined) {
+  if (paginationStatus === "LoadingFirstPage") {
     return (
       <div className="p-8 flex items-center justify-center">
         <div className="animate-pulse text-istk-textDim">Loading workflows...</div>
@@ -121,7 +130,7 @@ export default function WorkflowsPage() {
       <div>
         <h1 className="text-3xl font-bold text-gradient text-glow">Workflows</h1>
         <p className="text-istk-textMuted mt-1">
-          {workflows.length} workflow{workflows.length !== 1 ? "s" : ""} found
+          {workflows.length}{canLoadMore ? "+" : ""} workflow{workflows.length !== 1 ? "s" : ""} found
         </p>
       </div>
 
@@ -221,6 +230,19 @@ export default function WorkflowsPage() {
         })}
       </div>
 
+      {/* Load More */}
+      {(canLoadMore || paginationStatus === "LoadingMore") && (
+        <div className="flex justify-center">
+          <button
+            onClick={() => loadMore(PAGE_SIZE)}
+            disabled={paginationStatus === "LoadingMore"}
+            className="px-4 py-2 rounded-lg text-xs font-medium text-istk-textMuted hover:text-istk-text hover:bg-zinc-800/30 border border-zinc-800/50 transition-all duration-300 disabled:opacity-50"
+          >
+            {paginationStatus === "LoadingMore" ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
+
       {/* Empty State */}
       {workflows.length === 0 && (
         <div className="flex flex-col items-center justify-center py-16">
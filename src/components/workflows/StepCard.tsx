@@ -21,6 +21,7 @@ interface WorkflowStep {
   createdAt?: string;
   reviewNotes?: string;
   reviewedAt?: string;
+  servedModelId?: string;
 }
 
 interface StepCardProps {
@@ -629,6 +630,7 @@ export default function StepCard({
                 {step.agentRole}
               </span>
               {duration && <span className="ml-2">• {duration}</span>}
+              {step.servedModelId && <span className="ml-2 font-mono">• {step.servedModelId}</span>}
             </p>
           </div>
         </div>